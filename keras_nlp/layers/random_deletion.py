@@ -13,6 +13,7 @@
 # limitations under the License.
 import random
 
+import numpy as np
 import tensorflow as tf
 from tensorflow import keras
 
@@ -36,11 +37,12 @@ class RandomDeletion(keras.layers.Layer):
         max_deletions: The maximum number of tokens to delete.
         skip_list: A list of token values that should not be considered
             candidates for deletion.
-        skip_fn: A function that takes as input a scalar tensor token and
-            returns as output a scalar tensor True/False value. A value of
-            True indicates that the token should not be considered a
+        skip_fn: A function that takes as input a rank-1 tensor of tokens and
+            returns as output a boolean tensor of the same shape. A value
+            of True indicates that the token should not be considered a
             candidate for deletion. This function must be tracable--it
-            should consist of tensorflow operations.
+            should consist of tensorflow operations that work elementwise,
+            such as `tf.strings.regex_full_match`.
         skip_py_fn: A function that takes as input a python token value and
             returns as output `True` or `False`. A value of True
             indicates that should not be considered a candidate for deletion.
@@ -177,24 +179,24 @@ class RandomDeletion(keras.layers.Layer):
         if self.skip_list:
             skip_masks = self.StaticHashTable.lookup(inputs.flat_values)
         elif self.skip_fn:
-            skip_masks = tf.map_fn(
-                self.skip_fn, inputs.flat_values, fn_output_signature=tf.bool
-            )
+            skip_masks = self.skip_fn(inputs.flat_values)
         elif self.skip_py_fn:
 
-            def string_fn(token):
-                return self.skip_py_fn(token.numpy().decode("utf-8"))
+            def string_fn(tokens):
+                return np.array(
+                    [self.skip_py_fn(t.decode("utf-8")) for t in tokens],
+                    dtype=bool,
+                )
 
-            def int_fn(token):
-                return self.skip_py_fn(token.numpy())
+            def int_fn(tokens):
+                return np.array(
+                    [self.skip_py_fn(t) for t in tokens], dtype=bool
+                )
 
             py_fn = string_fn if inputs.dtype == tf.string else int_fn
 
-            skip_masks = tf.map_fn(
-                lambda x: tf.py_function(py_fn, [x], tf.bool),
-                inputs.flat_values,
-                fn_output_signature=tf.bool,
-            )
+            # Call into python once for all tokens, not once per token.
+            skip_masks = tf.numpy_function(py_fn, [inputs.flat_values], tf.bool)
 
         positions_flat = tf.range(tf.size(inputs.flat_values))
         positions = inputs.with_flat_values(positions_flat)
@@ -32,8 +32,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tf.strings.reduce_join(augmented, separator=" ", axis=-1)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"I like", b"and Tensorflow"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
     def test_shape_and_output_from_character_swaps(self):
         keras.utils.set_random_seed(1337)
@@ -46,8 +45,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tf.strings.reduce_join(augmented, axis=-1)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"Hey I lie", b"Keras and Tensoflow"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
     def test_with_integer_tokens(self):
         keras.utils.set_random_seed(1337)
@@ -61,8 +59,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tokenizer.detokenize(augmented)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"Hey Ile", b"Keas and ensoflw"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
     def test_skip_options(self):
         keras.utils.set_random_seed(1337)
@@ -75,13 +72,10 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tf.strings.reduce_join(augmented, separator=" ", axis=-1)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"I like", b"and Tensorflow"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         def skip_fn(word):
-            if word == "Tensorflow" or word == "like":
-                return True
-            return False
+            return tf.logical_or(word == "Tensorflow", word == "like")
 
         augmenter = random_deletion.RandomDeletion(
             rate=0.4, max_deletions=1, seed=42, skip_fn=skip_fn
@@ -90,8 +84,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tf.strings.reduce_join(augmented, separator=" ", axis=-1)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"Hey like", b"Keras Tensorflow"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         def skip_py_fn(word):
             if word == "Tensorflow" or word == "like":
@@ -105,8 +98,20 @@ class RandomDeletionTest(tf.test.TestCase):
         output = tf.strings.reduce_join(augmented, separator=" ", axis=-1)
         self.assertAllEqual(output.shape, tf.convert_to_tensor(inputs).shape)
         exp_output = [b"Hey like", b"Keras Tensorflow"]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
+
+    def test_skip_py_fn_with_integer_tokens(self):
+        def skip_py_fn(token):
+            return token % 2 == 0
+
+        keras.utils.set_random_seed(1337)
+        inputs = tf.constant([[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
+        augmenter = random_deletion.RandomDeletion(
+            rate=0.9, seed=42, skip_py_fn=skip_py_fn
+        )
+        output = augmenter(inputs)
+        exp_output = [[2, 4], [6, 8, 10]]
+        self.assertAllEqual(output, exp_output)
 
     def test_get_config_and_from_config(self):
         augmenter = random_deletion.RandomDeletion(
@@ -141,8 +146,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = ds.take(1).get_single_element()
 
         exp_output = [[b"I", b"like"], [b"Keras", b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         def skip_fn(word):
             return tf.strings.regex_full_match(word, r"\pP")
@@ -158,8 +162,7 @@ class RandomDeletionTest(tf.test.TestCase):
         ds = ds.apply(tf.data.experimental.dense_to_ragged_batch(2))
         output = ds.take(1).get_single_element()
         exp_output = [[b"I", b"like"], [b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         augmenter = random_deletion.RandomDeletion(
             rate=0.8, max_deletions=1, seed=42, skip_py_fn=skip_py_fn
@@ -169,8 +172,7 @@ class RandomDeletionTest(tf.test.TestCase):
         ds = ds.apply(tf.data.experimental.dense_to_ragged_batch(2))
         output = ds.take(1).get_single_element()
         exp_output = [[b"Hey", b"I"], [b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
     def test_batch_first_augment_second(self):
         keras.utils.set_random_seed(1337)
@@ -184,8 +186,7 @@ class RandomDeletionTest(tf.test.TestCase):
         output = ds.take(1).get_single_element()
 
         exp_output = [[b"I", b"like"], [b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         def skip_fn(word):
             return tf.strings.regex_full_match(word, r"\pP")
@@ -200,8 +201,7 @@ class RandomDeletionTest(tf.test.TestCase):
         ds = ds.batch(5).map(augmenter)
         output = ds.take(1).get_single_element()
         exp_output = [[b"I", b"like"], [b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
         augmenter = random_deletion.RandomDeletion(
             rate=0.8, max_deletions=1, seed=42, skip_py_fn=skip_py_fn
@@ -210,8 +210,7 @@ class RandomDeletionTest(tf.test.TestCase):
         ds = ds.batch(5).map(augmenter)
         output = ds.take(1).get_single_element()
         exp_output = [[b"Hey", b"I"], [b"and", b"Tensorflow"]]
-        for i in range(output.shape[0]):
-            self.assertAllEqual(output[i], exp_output[i])
+        self.assertAllEqual(output, exp_output)
 
     def test_functional_model(self):
         keras.utils.set_random_seed(1337)
@@ -13,6 +13,7 @@
 # limitations under the License.
 import random
 
+import numpy as np
 import tensorflow as tf
 from tensorflow import keras
 
@@ -29,7 +30,8 @@ class RandomSwap(keras.layers.Layer):
     word for word level swaps.
 
     Input should be either a `tf.RaggedTensor` or a dense `tf.Tensor`, and
-    either rank-1 or rank-2.
+    either rank-1 or rank-2. The output has the same type and shape as the
+    input.
 
     Args:
         rate: The probability of a given token being chosen to be swapped
@@ -37,11 +39,12 @@ class RandomSwap(keras.layers.Layer):
         max_swaps: The maximum number of swaps to be performed.
         skip_list: A list of token values that should not be considered
             candidates for deletion.
-        skip_fn: A function that takes as input a scalar tensor token and
-            returns as output a scalar tensor True/False value. A value of
-            True indicates that the token should not be considered a
+        skip_fn: A function that takes as input a rank-1 tensor of tokens and
+            returns as output a boolean tensor of the same shape. A value
+            of True indicates that the token should not be considered a
             candidate for deletion. This function must be tracable--it
-            should consist of tensorflow operations.
+            should consist of tensorflow operations that work elementwise,
+            such as `tf.strings.regex_full_match`.
         skip_py_fn: A function that takes as input a python token value and
             returns as output `True` or `False`. A value of True
             indicates that should not be considered a candidate for deletion.
@@ -171,42 +174,57 @@ class RandomSwap(keras.layers.Layer):
             # Add a new axis at the beginning.
             inputs = tf.expand_dims(inputs, axis=0)
         if isinstance(inputs, tf.Tensor):
-            # Convert to ragged tensor.
-            inputs = tf.RaggedTensor.from_tensor(inputs)
+            # Swaps keep the input shape, so flatten dense inputs directly
+            # rather than converting them to a ragged tensor.
+            flat_values = tf.reshape(inputs, [-1])
+            row_splits = tf.range(tf.shape(inputs)[0] + 1) * tf.shape(inputs)[1]
+        else:
+            flat_values = inputs.flat_values
+            row_splits = inputs.row_splits
 
         skip_masks = None
         if self.skip_list:
-            skip_masks = self.StaticHashTable.lookup(inputs.flat_values)
+            skip_masks = self.StaticHashTable.lookup(flat_values)
         elif self.skip_fn:
-            skip_masks = tf.map_fn(
-                self.skip_fn, inputs.flat_values, fn_output_signature=tf.bool
-            )
+            skip_masks = self.skip_fn(flat_values)
         elif self.skip_py_fn:
 
-            def string_fn(token):
-                return self.skip_py_fn(token.numpy().decode("utf-8"))
-
-            def int_fn(token):
-                return self.skip_py_fn(token.numpy())
+            def string_fn(tokens):
+                return np.array(
+                    [self.skip_py_fn(t.decode("utf-8")) for t in tokens],
+                    dtype=bool,
+                )
 
-            py_fn = string_fn if inputs.dtype == tf.string else int_fn
+            def int_fn(tokens):
+                return np.array(
+                    [self.skip_py_fn(t) for t in tokens], dtype=bool
+                )
 
-            skip_masks = tf.map_fn(
-                lambda x: tf.py_function(py_fn, [x], tf.bool),
-                inputs.flat_values,
-                fn_output_signature=tf.bool,
-            )
+            py_fn = string_fn if flat_values.dtype == tf.string else int_fn
 
-        positions = tf.ragged.range(inputs.row_lengths())
+            # Call into python once for all tokens, not once per token.
+            skip_masks = tf.numpy_function(py_fn, [flat_values], tf.bool)
 
+        # Work on the flat token positions and their row ids directly, and
+        # only restore the input's structure at the very end.
+        positions_flat = tf.range(tf.size(flat_values))
+        candidates = positions_flat
+        candidate_rows = tf.ragged.row_splits_to_segment_ids(
+            row_splits, out_type=tf.int32
+        )
         if skip_masks is not None:
             skip_masks = tf.logical_not(skip_masks)
             skip_masks.set_shape([None])
-            positions = tf.ragged.boolean_mask(
-                positions, inputs.with_flat_values(skip_masks)
-            )
+            candidates = tf.boolean_mask(candidates, skip_masks)
+            candidate_rows = tf.boolean_mask(candidate_rows, skip_masks)
+        num_rows = tf.shape(row_splits)[0] - 1
+        candidate_counts = tf.math.bincount(
+            candidate_rows, minlength=num_rows, maxlength=num_rows
+        )
+        candidate_starts = tf.cumsum(candidate_counts, exclusive=True)
+
         # Figure out how many we are going to select.
-        token_counts = tf.cast(positions.row_lengths(), "float32")
+        token_counts = tf.cast(candidate_counts, "float32")
         num_to_select = tf.random.stateless_binomial(
             shape=tf.shape(token_counts),
             seed=self._generator.make_seeds()[:, 0],
@@ -215,38 +233,68 @@ class RandomSwap(keras.layers.Layer):
         )
         if self.max_swaps is not None:
             num_to_select = tf.math.minimum(num_to_select, self.max_swaps)
-        num_to_select = tf.math.minimum(
-            num_to_select, tf.cast(positions.row_lengths(), tf.int32)
-        )
-        num_to_select = tf.cast(num_to_select, tf.int64)
-
-        def _swap(x):
-            positions, inputs, num_to_select = x
-            for _ in range(num_to_select):
-                index = tf.random.stateless_uniform(
-                    shape=[2],
-                    minval=0,
-                    maxval=tf.size(positions),
-                    dtype=tf.int32,
-                    seed=self._generator.make_seeds()[:, 0],
-                )
-                index1, index2 = positions[index[0]], positions[index[1]]
-                # swap items at the sampled indices with each other
-                inputs = tf.tensor_scatter_nd_update(
-                    inputs,
-                    [[index1], [index2]],
-                    [inputs[index2], inputs[index1]],
-                )
-            return inputs
+        num_to_select = tf.math.minimum(num_to_select, candidate_counts)
 
-        swapped = tf.map_fn(
-            _swap,
-            (positions, inputs, num_to_select),
-            fn_output_signature=tf.RaggedTensorSpec(
-                ragged_rank=positions.ragged_rank - 1, dtype=inputs.dtype
+        # Draw every swap up front, in the same row by row order as a
+        # per-row loop would, so a seeded layer keeps producing the same
+        # augmentations. Each swap's candidate range is looked up once,
+        # outside the loop, and a draw touches no token buffers.
+        swap_rows = tf.repeat(tf.range(num_rows), num_to_select)
+        swap_counts = tf.gather(candidate_counts, swap_rows)
+        swap_starts = tf.gather(candidate_starts, swap_rows)
+        num_swaps = tf.size(swap_rows)
+
+        def _draw(step, indices):
+            index = tf.random.stateless_uniform(
+                shape=[2],
+                minval=0,
+                maxval=swap_counts[step],
+                dtype=tf.int32,
+                seed=self._generator.make_seeds()[:, 0],
+            )
+            return step + 1, indices.write(step, swap_starts[step] + index)
+
+        _, indices = tf.while_loop(
+            cond=lambda step, _: step < num_swaps,
+            body=_draw,
+            loop_vars=(
+                tf.constant(0),
+                tf.TensorArray(tf.int32, size=num_swaps, element_shape=[2]),
             ),
         )
-        swapped.flat_values.set_shape([None])
+        pairs = tf.gather(candidates, indices.stack())
+
+        # Compose the swaps into a single permutation of the flat token
+        # positions, then apply it with one gather. Step `i` applies the
+        # `i`-th swap of every row at once; rows never share positions, so
+        # the loop runs `max(num_to_select)` times rather than once per swap.
+        swap_steps = tf.ragged.range(num_to_select).flat_values
+        max_num_to_select = tf.reduce_max(num_to_select)
+
+        def _swap(step, permutation):
+            step_pairs = tf.boolean_mask(pairs, tf.equal(swap_steps, step))
+            # swap items at the sampled indices with each other
+            permutation = tf.tensor_scatter_nd_update(
+                permutation,
+                tf.reshape(step_pairs, [-1, 1]),
+                tf.gather(
+                    permutation, tf.reshape(tf.reverse(step_pairs, [1]), [-1])
+                ),
+            )
+            return step + 1, permutation
+
+        _, permutation = tf.while_loop(
+            cond=lambda step, _: step < max_num_to_select,
+            body=_swap,
+            loop_vars=(tf.constant(0), positions_flat),
+        )
+        swapped = tf.gather(flat_values, permutation)
+        if isinstance(inputs, tf.Tensor):
+            swapped = tf.reshape(swapped, tf.shape(inputs))
+        else:
+            swapped = tf.RaggedTensor.from_row_splits(
+                swapped, row_splits, validate=False
+            )
 
         if input_is_1d:
             swapped = tf.squeeze(swapped, axis=0)
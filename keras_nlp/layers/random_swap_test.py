@@ -47,12 +47,21 @@ class RandomSwapTest(tf.test.TestCase):
         inputs = tf.constant([[1, 2, 3], [4, 5, 6]])
         augmenter = RandomSwap(rate=0.7, max_swaps=6, seed=42)
         output = augmenter(inputs)
-        self.assertAllEqual(
-            output.to_tensor().shape, tf.convert_to_tensor(inputs).shape
-        )
+        self.assertIsInstance(output, tf.Tensor)
+        self.assertAllEqual(output.shape, inputs.shape)
         exp_output = [[3, 2, 1], [6, 4, 5]]
         self.assertAllEqual(output, exp_output)
 
+    def test_dense_rank_1_input(self):
+        keras.utils.set_random_seed(1337)
+        inputs = tf.constant([1, 2, 3, 4, 5])
+        augmenter = RandomSwap(rate=0.7, max_swaps=3, seed=42)
+        output = augmenter(inputs)
+        self.assertIsInstance(output, tf.Tensor)
+        self.assertAllEqual(output.shape, inputs.shape)
+        exp_output = [4, 2, 3, 1, 5]
+        self.assertAllEqual(output, exp_output)
+
     def test_skip_options(self):
         keras.utils.set_random_seed(1337)
         augmenter = RandomSwap(
@@ -67,9 +76,7 @@ class RandomSwapTest(tf.test.TestCase):
         self.assertAllEqual(output, exp_output)
 
         def skip_fn(word):
-            if word == "Tensorflow" or word == "like":
-                return True
-            return False
+            return tf.logical_or(word == "Tensorflow", word == "like")
 
         augmenter = RandomSwap(rate=0.9, max_swaps=3, seed=11, skip_fn=skip_fn)
         augmented = augmenter(split)
@@ -92,6 +99,19 @@ class RandomSwapTest(tf.test.TestCase):
         exp_output = [b"I Hey like", b"Keras and Tensorflow"]
         self.assertAllEqual(output, exp_output)
 
+    def test_skip_py_fn_with_integer_tokens(self):
+        def skip_py_fn(token):
+            return token % 2 == 0
+
+        keras.utils.set_random_seed(1337)
+        inputs = tf.constant([[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
+        augmenter = RandomSwap(
+            rate=0.9, max_swaps=3, seed=42, skip_py_fn=skip_py_fn
+        )
+        output = augmenter(inputs)
+        exp_output = [[5, 2, 3, 4, 1], [6, 9, 8, 7, 10]]
+        self.assertAllEqual(output, exp_output)
+
     def test_get_config_and_from_config(self):
         augmenter = RandomSwap(rate=0.4, max_swaps=3, seed=42)
 
@@ -199,6 +219,20 @@ class RandomSwapTest(tf.test.TestCase):
         ]
         self.assertAllEqual(output, exp_output)
 
+    def test_batch_first_augment_second_dense(self):
+        keras.utils.set_random_seed(1337)
+        augmenter = RandomSwap(rate=0.7, max_swaps=2, seed=42)
+        inputs = [["Hey", "I", "like"], ["Keras", "and", "Tensorflow"]]
+        ds = tf.data.Dataset.from_tensor_slices(tf.constant(inputs))
+        ds = ds.batch(2).map(augmenter)
+        self.assertIsInstance(ds.element_spec, tf.TensorSpec)
+        output = ds.take(1).get_single_element()
+        exp_output = [
+            [b"like", b"I", b"Hey"],
+            [b"Tensorflow", b"Keras", b"and"],
+        ]
+        self.assertAllEqual(output, exp_output)
+
     def test_functional_model(self):
         keras.utils.set_random_seed(1337)
         input_data = tf.constant(["Hey I like", "Keras and Tensorflow"])